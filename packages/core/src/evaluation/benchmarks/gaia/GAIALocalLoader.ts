@@ -2,9 +2,10 @@ import { existsSync, readFileSync } from "node:fs"
 import { dirname, join } from "node:path"
 import { fileURLToPath } from "node:url"
 import type { GAIAInstance } from "@core/workflow/ingestion/ingestion.types"
+import { forEachLine } from "./jsonl"
 
 /**
- * Local GAIA dataset loader that reads from cached JSON files
+ * Local GAIA dataset loader that reads from cached JSONL files
  * This avoids the need for API calls and Python dependencies at runtime
  */
 export class GAIALocalLoader {
@@ -15,7 +16,33 @@ export class GAIALocalLoader {
   private static readonly SKIP_INSTANCES_WITH_FILES = true // Set to false to include instances with files
 
   /**
-   * Load a split's data from JSON file
+   * Resolve the cached file for a split, preferring JSONL over the legacy JSON array
+   */
+  private static splitPath(split: "validation" | "test"): string | null {
+    const jsonlPath = join(GAIALocalLoader.dataDir, `${split}.jsonl`)
+    if (existsSync(jsonlPath)) return jsonlPath
+    const jsonPath = join(GAIALocalLoader.dataDir, `${split}.json`)
+    return existsSync(jsonPath) ? jsonPath : null
+  }
+
+  /**
+   * Parse one JSON object per line, ignoring blank and malformed lines
+   */
+  private static parseJsonl(text: string): GAIAInstance[] {
+    const data: GAIAInstance[] = []
+    forEachLine(text, line => {
+      if (!line.trim()) return
+      try {
+        data.push(JSON.parse(line))
+      } catch {
+        // skip malformed lines
+      }
+    })
+    return data
+  }
+
+  /**
+   * Load a split's data from its cached file
    */
   private static loadSplit(split: "validation" | "test"): GAIAInstance[] {
     // Check cache first
@@ -23,16 +50,18 @@ export class GAIALocalLoader {
       return GAIALocalLoader.cache.get(split)!
     }
 
-    const filePath = join(GAIALocalLoader.dataDir, `${split}.json`)
+    const filePath = GAIALocalLoader.splitPath(split)
 
-    if (!existsSync(filePath)) {
+    if (!filePath) {
       throw new Error(
-        `GAIA ${split} data not found. Please run: bun tsx core/src/evaluation/benchmarks/gaia/download_gaia.ts`,
+        `GAIA ${split} data not found. ` +
+          "Please run (from packages/core): bun run src/evaluation/benchmarks/gaia/download_gaia.ts",
       )
     }
 
     try {
-      const data = JSON.parse(readFileSync(filePath, "utf-8"))
+      const text = readFileSync(filePath, "utf-8")
+      const data: GAIAInstance[] = filePath.endsWith(".jsonl") ? GAIALocalLoader.parseJsonl(text) : JSON.parse(text)
       GAIALocalLoader.cache.set(split, data)
       return data
     } catch (error) {
@@ -99,9 +128,8 @@ export class GAIALocalLoader {
       return true
     })
 
-    // Shuffle and take first n items
-    const shuffled = [...available].sort(() => Math.random() - 0.5)
-    return shuffled.slice(0, count)
+    // Shuffle and take first n items; filter() already returned a fresh array, so sort it in place
+    return available.sort(() => Math.random() - 0.5).slice(0, count)
   }
 
   /**
@@ -145,7 +173,6 @@ export class GAIALocalLoader {
    * Check if data files exist
    */
   static isDataAvailable(): boolean {
-    const validationPath = join(GAIALocalLoader.dataDir, "validation.json")
-    return existsSync(validationPath)
+    return GAIALocalLoader.splitPath("validation") !== null
   }
 }
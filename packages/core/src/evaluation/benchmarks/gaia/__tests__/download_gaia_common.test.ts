@@ -0,0 +1,206 @@
+import { existsSync, mkdirSync, readFileSync, rmSync, writeFileSync } from "node:fs"
+import os from "node:os"
+import path from "node:path"
+import { afterEach, beforeEach, describe, expect, it, vi } from "vitest"
+
+vi.mock("@core/utils/env.mjs", () => ({
+  envi: {
+    HF_TOKEN: "test-hf-token",
+  },
+}))
+
+import { downloadSplitFiles, transformRow } from "../download_gaia_common"
+
+const TEST_ROOT = path.join(os.tmpdir(), "together-tests", "gaia-download")
+
+const VALIDATION_JSONL = [
+  JSON.stringify({ task_id: "a", Question: "Q1", Level: 1, "Final answer": "x", file_name: "" }),
+  JSON.stringify({ task_id: "b", Question: "Q2", Level: 2, "Final answer": "y", file_name: "" }),
+  "",
+].join("\n")
+
+// serve the body in tiny chunks so lines and multi-byte characters straddle chunk boundaries
+function chunkedBody(text: string, size = 7): ReadableStream<Uint8Array> {
+  const bytes = new TextEncoder().encode(text)
+  return new ReadableStream({
+    start(controller) {
+      for (let i = 0; i < bytes.length; i += size) controller.enqueue(bytes.slice(i, i + size))
+      controller.close()
+    },
+  })
+}
+
+// answer the validation file with `validation`, and every other split with an empty body
+function stubFetch(validation: () => Response) {
+  const fetchMock = vi.fn(async (url: string, _init?: RequestInit) =>
+    url.endsWith("/validation.jsonl") ? validation() : new Response("", { status: 200, headers: { etag: '"empty"' } }),
+  )
+  vi.stubGlobal("fetch", fetchMock)
+  return fetchMock
+}
+
+function validationHeaders(fetchMock: ReturnType<typeof stubFetch>): Record<string, string> {
+  const call = fetchMock.mock.calls.find(([url]) => url.endsWith("/validation.jsonl"))!
+  return call[1]!.headers as Record<string, string>
+}
+
+function readOutput(name: string): string {
+  return readFileSync(path.join(TEST_ROOT, name), "utf-8")
+}
+
+function writeCache(entry: Record<string, unknown>): void {
+  writeFileSync(path.join(TEST_ROOT, "metadata.json"), JSON.stringify({ files: { validation: entry } }))
+}
+
+describe("transformRow", () => {
+  it("keeps the cached GAIA fields and drops the rest", () => {
+    const raw = {
+      task_id: "task-1",
+      Question: "What is 2 + 2?",
+      Level: "2",
+      "Final answer": 4,
+      "Annotator Metadata": { steps: "add" },
+    }
+    const row = transformRow(raw)
+
+    expect(row).toEqual({ task_id: "task-1", Question: "What is 2 + 2?", Level: 2, "Final answer": "4" })
+  })
+
+  it("omits empty optional fields", () => {
+    const row = transformRow({ task_id: "task-2", Question: "Q", Level: 1, "Final answer": "", file_name: "" })
+
+    expect(row).toEqual({ task_id: "task-2", Question: "Q", Level: 1 })
+    expect(row).not.toHaveProperty("file_name")
+    expect(JSON.stringify(row)).toBe('{"task_id":"task-2","Question":"Q","Level":1}')
+  })
+
+  it("falls back to level 0 when the upstream level is missing or not numeric", () => {
+    expect(transformRow({ task_id: "task-4", Question: "Q" })?.Level).toBe(0)
+    expect(transformRow({ task_id: "task-5", Question: "Q", Level: "n/a" })?.Level).toBe(0)
+  })
+
+  it("skips instances with files and the placeholder task", () => {
+    expect(transformRow({ task_id: "task-3", Question: "Q", Level: 1, file_name: "sheet.xlsx" })).toBeNull()
+    expect(transformRow({ task_id: "0-0-0-0-0", Question: "Q", Level: 1 })).toBeNull()
+  })
+})
+
+describe("downloadSplitFiles", () => {
+  beforeEach(() => {
+    rmSync(TEST_ROOT, { recursive: true, force: true })
+    mkdirSync(TEST_ROOT, { recursive: true })
+    vi.spyOn(console, "log").mockImplementation(() => {})
+    vi.spyOn(console, "warn").mockImplementation(() => {})
+  })
+
+  afterEach(() => {
+    vi.unstubAllGlobals()
+    vi.restoreAllMocks()
+    rmSync(TEST_ROOT, { recursive: true, force: true })
+  })
+
+  it("streams JSONL into {split}.jsonl and records the ETag", async () => {
+    stubFetch(() => new Response(chunkedBody(VALIDATION_JSONL), { status: 200, headers: { etag: '"v1"' } }))
+
+    await downloadSplitFiles("direct", { outputDir: TEST_ROOT })
+
+    expect(readOutput("validation.jsonl")).toBe(
+      '{"task_id":"a","Question":"Q1","Level":1,"Final answer":"x"}\n' +
+        '{"task_id":"b","Question":"Q2","Level":2,"Final answer":"y"}\n',
+    )
+    const metadata = JSON.parse(readOutput("metadata.json"))
+    expect(metadata.total_items).toBe(2)
+    expect(metadata.files.validation).toEqual({ file: "validation.jsonl", etag: '"v1"', items: 2, passthrough: false })
+  })
+
+  it("writes the same JSONL when the split is served as a pretty-printed JSON array", async () => {
+    stubFetch(() => new Response(chunkedBody(VALIDATION_JSONL), { status: 200 }))
+    await downloadSplitFiles("direct", { outputDir: TEST_ROOT })
+    const fromJsonl = readOutput("validation.jsonl")
+
+    const records = VALIDATION_JSONL.split("\n")
+      .filter(Boolean)
+      .map(line => JSON.parse(line))
+    const arrayBody = `\n  \n${JSON.stringify(records, null, 2)}\n`
+    stubFetch(() => new Response(chunkedBody(arrayBody, 5), { status: 200 }))
+    await downloadSplitFiles("direct", { outputDir: TEST_ROOT })
+
+    expect(readOutput("validation.jsonl")).toBe(fromJsonl)
+    expect(JSON.parse(readOutput("metadata.json")).total_items).toBe(2)
+  })
+
+  it("copies only rows that need no conversion in passthrough mode and parses the rest", async () => {
+    const body = [
+      `${JSON.stringify({ task_id: "a", Question: "Q1", Level: 1, file_name: "" })}\r`,
+      JSON.stringify({ task_id: "b", Question: "Q2", Level: "2", file_name: "" }),
+      JSON.stringify({ task_id: "c", Question: "Q3", Level: 1, file_name: "sheet.xlsx" }),
+      JSON.stringify({ task_id: "d", Question: "Q4", Level: "3", file_name: "sheet.xlsx" }),
+      JSON.stringify({ task_id: "0-0-0-0-0", Question: "Q5", Level: 1 }),
+      '{broken"}',
+      JSON.stringify({ task_id: "e", Question: "Q6", Level: null, "Final answer": 7 }),
+      "",
+    ].join("\n")
+    stubFetch(() => new Response(chunkedBody(body), { status: 200, headers: { etag: '"v1"' } }))
+
+    await downloadSplitFiles("direct", { passthrough: true, outputDir: TEST_ROOT })
+
+    expect(readOutput("validation.jsonl")).toBe(
+      '{"task_id":"a","Question":"Q1","Level":1,"file_name":""}\n' +
+        '{"task_id":"b","Question":"Q2","Level":2}\n' +
+        '{"task_id":"e","Question":"Q6","Level":0,"Final answer":"7"}\n',
+    )
+    const metadata = JSON.parse(readOutput("metadata.json"))
+    expect(metadata.total_items).toBe(3)
+    expect(metadata.files.validation).toEqual({ file: "validation.jsonl", etag: '"v1"', items: 3, passthrough: true })
+  })
+
+  it("reuses the cached count when the server answers 304", async () => {
+    writeFileSync(path.join(TEST_ROOT, "validation.jsonl"), "cached\n")
+    writeCache({ file: "validation.jsonl", etag: '"v1"', items: 7, passthrough: false })
+    const fetchMock = stubFetch(() => new Response(null, { status: 304 }))
+
+    await downloadSplitFiles("direct", { outputDir: TEST_ROOT })
+
+    expect(validationHeaders(fetchMock)["If-None-Match"]).toBe('"v1"')
+    expect(readOutput("validation.jsonl")).toBe("cached\n")
+    const metadata = JSON.parse(readOutput("metadata.json"))
+    expect(metadata.total_items).toBe(7)
+    expect(metadata.files.validation.items).toBe(7)
+  })
+
+  it.each([
+    ["a different upstream file", { file: "other.jsonl", passthrough: false }, true],
+    ["a different mode", { file: "validation.jsonl", passthrough: true }, true],
+    ["a missing output file", { file: "validation.jsonl", passthrough: false }, false],
+  ])("sends no If-None-Match for a cache entry with %s", async (_label, entry, writeOutput) => {
+    if (writeOutput) writeFileSync(path.join(TEST_ROOT, "validation.jsonl"), "cached\n")
+    writeCache({ ...entry, etag: '"v1"', items: 7 })
+    const fetchMock = stubFetch(() => new Response(chunkedBody(VALIDATION_JSONL), { status: 200 }))
+
+    await downloadSplitFiles("direct", { outputDir: TEST_ROOT })
+
+    expect(validationHeaders(fetchMock)).not.toHaveProperty("If-None-Match")
+    expect(JSON.parse(readOutput("metadata.json")).total_items).toBe(2)
+  })
+
+  it("leaves neither a .partial nor a truncated file when the body errors mid-stream", async () => {
+    const bytes = new TextEncoder().encode(VALIDATION_JSONL)
+    const failing = new ReadableStream<Uint8Array>({
+      start(controller) {
+        controller.enqueue(bytes.slice(0, 40))
+      },
+      pull(controller) {
+        controller.error(new Error("connection reset"))
+      },
+    })
+    stubFetch(() => new Response(failing, { status: 200, headers: { etag: '"v1"' } }))
+
+    await downloadSplitFiles("direct", { outputDir: TEST_ROOT })
+
+    expect(existsSync(path.join(TEST_ROOT, "validation.jsonl"))).toBe(false)
+    expect(existsSync(path.join(TEST_ROOT, "validation.jsonl.partial"))).toBe(false)
+    const metadata = JSON.parse(readOutput("metadata.json"))
+    expect(metadata.total_items).toBe(0)
+    expect(metadata.files).not.toHaveProperty("validation")
+  })
+})
@@ -1,48 +1,28 @@
-import { mkdirSync, writeFileSync } from "node:fs"
-import { dirname, join } from "node:path"
 import { fileURLToPath } from "node:url"
-import { envi } from "@core/utils/env.mjs"
+import {
+  type GaiaRow,
+  type GaiaSplit,
+  OUTPUT_DIR,
+  ensureOutputDir,
+  saveJSON,
+  saveJSONL,
+  transformRow,
+} from "./download_gaia_common"
+import { GAIA_CONFIG, GAIA_DATASET, getAuthToken, getRequestHeaders } from "./download_gaia_config"
 
-type GaiaRow = {
-  task_id: string
-  Question: string
-  Level: number
-  "Final answer"?: string
-  file_name?: string
-}
-
-const DATASET = "gaia-benchmark/GAIA"
-const CONFIG = "2023"
 const BASE_URL = "https://datasets-server.huggingface.co/rows"
 
 const __filename = fileURLToPath(import.meta.url)
-const __dirname = dirname(__filename)
-const OUTPUT_DIR = join(__dirname, "output")
 
-function getAuthToken(): string {
-  if (!envi.HF_TOKEN) {
-    throw new Error("HF_TOKEN is not set in environment variables")
-  }
-  return envi.HF_TOKEN
-}
-
-async function fetchBatch(
-  split: "validation" | "test",
-  offset: number,
-  length: number,
-  authToken?: string,
-): Promise<any> {
+async function fetchBatch(split: GaiaSplit, offset: number, length: number): Promise<any> {
   const url = new URL(BASE_URL)
-  url.searchParams.set("dataset", DATASET)
-  url.searchParams.set("config", CONFIG)
+  url.searchParams.set("dataset", GAIA_DATASET)
+  url.searchParams.set("config", GAIA_CONFIG)
   url.searchParams.set("split", split)
   url.searchParams.set("offset", String(offset))
   url.searchParams.set("length", String(length))
 
-  const headers: HeadersInit = {}
-  if (authToken) headers.Authorization = `Bearer ${authToken}`
-
-  const res = await fetch(url.toString(), { headers })
+  const res = await fetch(url.toString(), { headers: getRequestHeaders() })
   if (!res.ok) {
     const body = await res.text().catch(() => "")
     throw new Error(`HTTP ${res.status} ${res.statusText}${body ? ` - ${body}` : ""}`)
@@ -50,34 +30,20 @@ async function fetchBatch(
   return res.json()
 }
 
-function mapRow(row: any): GaiaRow | null {
-  if (!row) return null
-  const out: GaiaRow = {
-    task_id: row.task_id,
-    Question: row.Question,
-    Level: Number(row.Level ?? 0),
-  }
-  if (row["Final answer"]) out["Final answer"] = String(row["Final answer"]) // keep GAIA key
-  if (row.file_name) out.file_name = String(row.file_name)
-  return out
-}
-
-async function downloadSplit(split: "validation" | "test", limit: number, authToken?: string): Promise<GaiaRow[]> {
+async function downloadSplit(split: GaiaSplit, limit: number): Promise<GaiaRow[]> {
   const batchSize = 100
   let offset = 0
   const items: GaiaRow[] = []
 
   while (items.length < limit) {
-    const batch = await fetchBatch(split, offset, batchSize, authToken)
+    const batch = await fetchBatch(split, offset, batchSize)
     const rows: any[] = Array.isArray(batch.rows) ? batch.rows : []
     if (rows.length === 0) break
 
     for (const r of rows) {
-      const mapped = mapRow(r.row)
+      if (!r.row) continue
+      const mapped = transformRow(r.row)
       if (!mapped) continue
-      if (mapped.task_id === "0-0-0-0-0") continue
-      // Skip instances with files to match loader default behavior
-      if (mapped.file_name) continue
 
       items.push(mapped)
       if (items.length >= limit) break
@@ -90,42 +56,39 @@ async function downloadSplit(split: "validation" | "test", limit: number, authTo
   return items
 }
 
-function ensureOutputDir(): void {
-  mkdirSync(OUTPUT_DIR, { recursive: true })
-}
-
-function saveJSON(filename: string, data: unknown): void {
-  const filepath = join(OUTPUT_DIR, filename)
-  writeFileSync(filepath, JSON.stringify(data, null, 2), { encoding: "utf-8" })
-}
-
 export async function downloadGAIA({
   validationLimit = 5_000,
   testLimit = 5_000,
+  outputDir = OUTPUT_DIR,
 }: {
   validationLimit?: number
   testLimit?: number
+  outputDir?: string
 } = {}): Promise<void> {
-  const token = getAuthToken()
-  ensureOutputDir()
+  getAuthToken()
+  ensureOutputDir(outputDir)
 
   try {
     const [validation, test] = await Promise.all([
-      downloadSplit("validation", validationLimit, token),
-      downloadSplit("test", testLimit, token),
+      downloadSplit("validation", validationLimit),
+      downloadSplit("test", testLimit),
     ])
 
-    saveJSON("validation.json", validation)
-    saveJSON("test.json", test)
-    saveJSON("metadata.json", {
-      dataset: DATASET,
-      config: CONFIG,
-      splits: ["validation", "test"],
-      total_items: validation.length + test.length,
-      source: "datasets-server",
-    })
+    saveJSONL("validation.jsonl", validation, outputDir)
+    saveJSONL("test.jsonl", test, outputDir)
+    saveJSON(
+      "metadata.json",
+      {
+        dataset: GAIA_DATASET,
+        config: GAIA_CONFIG,
+        splits: ["validation", "test"],
+        total_items: validation.length + test.length,
+        source: "datasets-server",
+      },
+      outputDir,
+    )
     // eslint-disable-next-line no-console
-    console.log(`GAIA downloaded to ${OUTPUT_DIR}`)
+    console.log(`GAIA downloaded to ${outputDir}`)
   } catch (err: any) {
     // eslint-disable-next-line no-console
     console.error("Failed to download GAIA via datasets-server:", err?.message || err)
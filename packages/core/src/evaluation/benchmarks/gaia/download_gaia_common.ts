@@ -0,0 +1,299 @@
+import { existsSync, mkdirSync, readFileSync, renameSync, rmSync, writeFileSync } from "node:fs"
+import { type FileHandle, open } from "node:fs/promises"
+import { dirname, join } from "node:path"
+import { fileURLToPath } from "node:url"
+import {
+  DOWNLOAD_DEADLINE_MS,
+  GAIA_BASE_FILES_URL,
+  GAIA_CONFIG,
+  GAIA_DATASET,
+  type GaiaSplit,
+  SPLIT_FILES,
+  type SplitFilesMethod,
+  getAuthToken,
+  getRequestHeaders,
+} from "./download_gaia_config"
+import { forEachLine } from "./jsonl"
+
+export type GaiaRow = {
+  task_id: string
+  Question: string
+  Level: number
+  "Final answer"?: string
+  file_name?: string
+}
+
+/**
+ * A record as it appears in the upstream JSONL / datasets-server rows, before mapping
+ */
+export type RawGaiaRow = {
+  task_id: string
+  Question: string
+  Level?: number | string | null
+  "Final answer"?: unknown
+  file_name?: unknown
+}
+
+export type { GaiaSplit }
+
+/**
+ * What metadata.json remembers about a downloaded split, so a re-run can ask for it conditionally
+ */
+type CachedSplitFile = {
+  file: string
+  etag: string
+  items: number
+  passthrough?: boolean
+}
+
+const WRITE_BATCH_CHARS = 1 << 20
+const STRING_TASK_ID = /"task_id"\s*:\s*"/
+const NUMERIC_LEVEL = /"Level"\s*:\s*-?\d/
+const NON_STRING_ANSWER = /"Final answer"\s*:\s*[^"\s]/
+const FILE_BACKED = /"file_name"\s*:\s*"[^"]/
+const PLACEHOLDER_TASK = /"task_id"\s*:\s*"0-0-0-0-0"/
+
+export const OUTPUT_DIR = join(dirname(fileURLToPath(import.meta.url)), "output")
+
+export function ensureOutputDir(outputDir = OUTPUT_DIR): void {
+  mkdirSync(outputDir, { recursive: true })
+}
+
+export function saveJSON(filename: string, data: unknown, outputDir = OUTPUT_DIR): void {
+  const filepath = join(outputDir, filename)
+  writeFileSync(filepath, JSON.stringify(data, null, 2), { encoding: "utf-8" })
+}
+
+export function saveJSONL(filename: string, rows: GaiaRow[], outputDir = OUTPUT_DIR): void {
+  const filepath = join(outputDir, filename)
+  let text = ""
+  for (const row of rows) text += `${JSON.stringify(row)}\n`
+  writeFileSync(filepath, text, { encoding: "utf-8" })
+}
+
+/**
+ * Map a raw GAIA record onto the cached schema; returns null for rows the loader skips by default
+ */
+export function transformRow(item: RawGaiaRow): GaiaRow | null {
+  // Skip instances with files to align with loader default
+  if (item.file_name || item.task_id === "0-0-0-0-0") return null
+
+  const answer = item["Final answer"]
+  const level = item.Level
+  return {
+    task_id: item.task_id,
+    Question: item.Question,
+    Level: typeof level === "number" ? level : Number(level) || 0,
+    "Final answer": answer ? (typeof answer === "string" ? answer : String(answer)) : undefined,
+  }
+}
+
+/**
+ * Fetch a file body, or null when the server answers 304 for the given ETag
+ */
+async function fetchBody(
+  url: string,
+  etag?: string,
+): Promise<{ body: ReadableStream<Uint8Array>; etag: string | null } | null> {
+  const headers = etag ? { ...getRequestHeaders(), "If-None-Match": etag } : getRequestHeaders()
+  // HTTP/1.1 keep-alive via fetch's pool; multiplexing both splits over HTTP/2 would need undici as a dependency
+  const res = await fetch(url, { headers, signal: AbortSignal.timeout(DOWNLOAD_DEADLINE_MS) })
+  if (etag && res.status === 304) return null
+  if (!res.ok) {
+    const body = await res.text().catch(() => "")
+    throw new Error(`HTTP ${res.status} ${res.statusText}${body ? ` - ${body}` : ""}`)
+  }
+  if (!res.body) throw new Error(`Empty response body from ${url}`)
+  return { body: res.body, etag: res.headers.get("etag") }
+}
+
+/**
+ * Yield the body as blocks of complete JSONL lines as it arrives, so only the current chunk is held in memory
+ */
+async function* readLineBlocks(body: ReadableStream<Uint8Array>): AsyncGenerator<string> {
+  const reader = body.getReader()
+  const decoder = new TextDecoder()
+  let pending = ""
+  for (;;) {
+    const { done, value } = await reader.read()
+    pending += done ? decoder.decode() : decoder.decode(value, { stream: true })
+    if (done) break
+    // hand over everything up to the last newline in one piece; the partial tail waits for the next chunk
+    const cut = pending.lastIndexOf("\n")
+    if (cut === -1) continue
+    yield pending.slice(0, cut)
+    pending = pending.slice(cut + 1)
+  }
+  if (pending) yield pending
+}
+
+function parseLine(line: string): GaiaRow | null {
+  if (!line) return null
+  try {
+    return transformRow(JSON.parse(line))
+  } catch {
+    // skip malformed lines
+    return null
+  }
+}
+
+/**
+ * Cheap checks for passthrough mode. Returns the line (minus any CRLF "\r") when it looks like an object with a
+ * string task_id, a numeric Level, no non-string Final answer, no attached file and not the placeholder task;
+ * anything else returns null and goes through parseLine. The checks are not a JSON parser: a line that passes
+ * them but is still malformed is copied and counted, and GAIALocalLoader skips it on read.
+ */
+function passthroughLine(line: string): string | null {
+  const end = line.charCodeAt(line.length - 1) === 13 ? line.length - 1 : line.length
+  if (line[0] !== "{" || line[end - 1] !== "}") return null
+  if (!STRING_TASK_ID.test(line) || !NUMERIC_LEVEL.test(line)) return null
+  if (NON_STRING_ANSWER.test(line) || FILE_BACKED.test(line) || PLACEHOLDER_TASK.test(line)) return null
+  return end === line.length ? line : line.slice(0, end)
+}
+
+async function writeAll(out: FileHandle, text: string): Promise<void> {
+  const buf = Buffer.from(text, "utf-8")
+  let offset = 0
+  // FileHandle.write does not retry short writes, so keep going until the whole batch is on disk
+  while (offset < buf.length) {
+    const { bytesWritten } = await out.write(buf, offset, buf.length - offset)
+    offset += bytesWritten
+  }
+}
+
+/**
+ * Read the per-split ETags recorded by the previous run, if any
+ */
+function readCachedFiles(outputDir: string): Partial<Record<GaiaSplit, CachedSplitFile>> {
+  const filepath = join(outputDir, "metadata.json")
+  if (!existsSync(filepath)) return {}
+  try {
+    return JSON.parse(readFileSync(filepath, "utf-8")).files ?? {}
+  } catch {
+    return {}
+  }
+}
+
+/**
+ * Stream one split from the network straight into `${split}.jsonl`, one row per line.
+ * Accepts a JSON array body as well as JSONL, and skips the transfer entirely when
+ * the cached copy still matches the upstream ETag. In passthrough mode well-formed
+ * JSONL lines are copied verbatim instead of being parsed and re-serialized.
+ */
+async function processSplit(
+  outputDir: string,
+  split: GaiaSplit,
+  file: string,
+  passthrough: boolean,
+  cached?: CachedSplitFile,
+): Promise<{ items: number; etag: string | null }> {
+  const filepath = join(outputDir, `${split}.jsonl`)
+  const reusable =
+    cached && cached.file === file && (cached.passthrough ?? false) === passthrough && existsSync(filepath)
+      ? cached
+      : undefined
+  const response = await fetchBody(`${GAIA_BASE_FILES_URL}/${file}`, reusable?.etag)
+  if (!response) return { items: reusable!.items, etag: reusable!.etag }
+
+  // write next to the target and rename at the end, so a failed download never leaves a truncated file behind
+  const partialPath = `${filepath}.partial`
+  const out = await open(partialPath, "w")
+
+  let count = 0
+  let batch = ""
+  let format: "unknown" | "jsonl" | "array" = "unknown"
+  let arrayText = ""
+  try {
+    for await (const block of readLineBlocks(response.body)) {
+      if (format === "unknown") {
+        const first = block.trimStart()
+        if (!first) continue
+        format = first[0] === "[" ? "array" : "jsonl"
+      }
+      if (format === "array") {
+        arrayText += `${block}\n`
+        continue
+      }
+      forEachLine(block, line => {
+        const verbatim = passthrough ? passthroughLine(line) : null
+        if (verbatim) {
+          batch += `${verbatim}\n`
+          count++
+          return
+        }
+        const row = parseLine(line)
+        if (!row) return
+        batch += `${JSON.stringify(row)}\n`
+        count++
+      })
+      if (batch.length >= WRITE_BATCH_CHARS) {
+        await writeAll(out, batch)
+        batch = ""
+      }
+    }
+    if (format === "array") {
+      const items: unknown[] = JSON.parse(arrayText)
+      for (const item of items) {
+        const row = item && typeof item === "object" ? transformRow(item as RawGaiaRow) : null
+        if (!row) continue
+        batch += `${JSON.stringify(row)}\n`
+        count++
+      }
+    }
+    if (batch) await writeAll(out, batch)
+  } catch (e) {
+    await out.close()
+    rmSync(partialPath, { force: true })
+    throw e
+  }
+  await out.close()
+
+  renameSync(partialPath, filepath)
+  return { items: count, etag: response.etag }
+}
+
+/**
+ * Download the per-split JSONL files from the GAIA repo into `outputDir` and record metadata.json.
+ * With `passthrough`, rows that pass a cheap shape check are stored verbatim instead of parsed and re-serialized.
+ */
+export async function downloadSplitFiles(
+  method: SplitFilesMethod,
+  { passthrough = false, outputDir = OUTPUT_DIR }: { passthrough?: boolean; outputDir?: string } = {},
+): Promise<void> {
+  const files: Record<GaiaSplit, string> = SPLIT_FILES[method]
+  getAuthToken()
+  ensureOutputDir(outputDir)
+  const cachedFiles = readCachedFiles(outputDir)
+
+  const splits = ["validation", "test"] as const
+  const results = await Promise.all(
+    splits.map(async split => {
+      try {
+        return await processSplit(outputDir, split, files[split], passthrough, cachedFiles[split])
+      } catch (e: any) {
+        // eslint-disable-next-line no-console
+        console.warn(`Failed to download ${split} (${method}):`, e?.message || e)
+        return { items: 0, etag: null }
+      }
+    }),
+  )
+
+  const cacheEntries: Partial<Record<GaiaSplit, CachedSplitFile>> = {}
+  splits.forEach((split, i) => {
+    const { items, etag } = results[i]
+    if (etag) cacheEntries[split] = { file: files[split], etag, items, passthrough }
+  })
+
+  const metadata = {
+    dataset: GAIA_DATASET,
+    config: GAIA_CONFIG,
+    download_method: method,
+    splits: ["validation", "test"],
+    total_items: results[0].items + results[1].items,
+    files: cacheEntries,
+  }
+  saveJSON("metadata.json", metadata, outputDir)
+
+  // eslint-disable-next-line no-console
+  console.log(`GAIA (${method}) downloaded to ${outputDir}`)
+}
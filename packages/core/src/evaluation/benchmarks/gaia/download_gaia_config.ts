@@ -0,0 +1,45 @@
+import { envi } from "@core/utils/env.mjs"
+
+export const GAIA_DATASET = "gaia-benchmark/GAIA"
+export const GAIA_CONFIG = "2023"
+export const GAIA_BASE_FILES_URL = `https://huggingface.co/datasets/${GAIA_DATASET}/resolve/main/${GAIA_CONFIG}`
+// deadline for a whole split request, body streaming included; not a per-read stall timeout
+export const DOWNLOAD_DEADLINE_MS = 5 * 60_000
+
+export type GaiaSplit = "validation" | "test"
+
+/**
+ * Upstream JSONL path per split, for each file-based download method
+ */
+export const SPLIT_FILES = {
+  direct: {
+    validation: "validation.jsonl",
+    test: "test.jsonl",
+  },
+  metadata: {
+    validation: "validation/metadata.jsonl",
+    test: "test/metadata.jsonl",
+  },
+} satisfies Record<string, Record<GaiaSplit, string>>
+
+export type SplitFilesMethod = keyof typeof SPLIT_FILES
+
+let requestHeaders: Readonly<Record<string, string>> | null = null
+
+export function getAuthToken(): string {
+  if (!envi.HF_TOKEN) {
+    throw new Error("HF_TOKEN is not set in environment variables")
+  }
+  return envi.HF_TOKEN
+}
+
+/**
+ * Headers shared by every GAIA request, built once per process instead of per fetch
+ */
+export function getRequestHeaders(): Readonly<Record<string, string>> {
+  if (!requestHeaders) {
+    // no Accept-Encoding: fetch already negotiates br/gzip/deflate and decodes the body itself
+    requestHeaders = { Authorization: `Bearer ${getAuthToken()}` }
+  }
+  return requestHeaders
+}
@@ -17,7 +17,7 @@ async function runGAIAExample() {
   // check if GAIA data is available locally
   if (!GAIALocalLoader.isDataAvailable()) {
     console.log("❌ GAIA data not found!")
-    console.log("Please run: python download_gaia.py")
+    console.log("Please run (from packages/core): bun run src/evaluation/benchmarks/gaia/download_gaia.ts")
     console.log("Make sure to set HF_TOKEN environment variable first")
     return
   }
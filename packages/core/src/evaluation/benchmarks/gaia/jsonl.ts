@@ -0,0 +1,13 @@
+/**
+ * Call `visit` for every "\n"-separated line of `text`, without building an array of line strings.
+ * A trailing "\r" is left on the line; JSON.parse skips it like any other whitespace.
+ */
+export function forEachLine(text: string, visit: (line: string) => void): void {
+  let start = 0
+  while (start < text.length) {
+    let end = text.indexOf("\n", start)
+    if (end === -1) end = text.length
+    visit(text.slice(start, end))
+    start = end + 1
+  }
+}
@@ -0,0 +1,61 @@
+import { mkdirSync, rmSync, writeFileSync } from "node:fs"
+import os from "node:os"
+import path from "node:path"
+import { GAIALocalLoader } from "@core/evaluation/benchmarks/gaia/GAIALocalLoader"
+import { afterEach, beforeEach, describe, expect, it } from "vitest"
+
+const TEST_ROOT = path.join(os.tmpdir(), "together-tests", "gaia-local-loader")
+
+// point the loader at a scratch output dir and start every test with an empty cache
+const loader = GAIALocalLoader as unknown as { dataDir: string; cache: Map<string, unknown> }
+
+describe("GAIALocalLoader", () => {
+  beforeEach(() => {
+    rmSync(TEST_ROOT, { recursive: true, force: true })
+    mkdirSync(TEST_ROOT, { recursive: true })
+    loader.dataDir = TEST_ROOT
+    loader.cache.clear()
+  })
+
+  afterEach(() => {
+    rmSync(TEST_ROOT, { recursive: true, force: true })
+  })
+
+  it("reads one instance per line from validation.jsonl", () => {
+    writeFileSync(
+      path.join(TEST_ROOT, "validation.jsonl"),
+      [
+        JSON.stringify({ task_id: "a", Question: "Q1", Level: 1, "Final answer": "x" }),
+        "",
+        JSON.stringify({ task_id: "b", Question: "Q2", Level: 2 }),
+        "",
+      ].join("\n"),
+    )
+
+    expect(GAIALocalLoader.isDataAvailable()).toBe(true)
+    expect(GAIALocalLoader.fetchById("b").Question).toBe("Q2")
+    expect(GAIALocalLoader.getStats("validation")).toEqual({ total: 2, byLevel: { 1: 1, 2: 1, 3: 0 }, hasFile: 0 })
+  })
+
+  it("skips malformed lines instead of failing the whole split", () => {
+    writeFileSync(
+      path.join(TEST_ROOT, "validation.jsonl"),
+      ['{"task_id":"a","Level":1,}', JSON.stringify({ task_id: "b", Question: "Q2", Level: 2 }), ""].join("\n"),
+    )
+
+    expect(GAIALocalLoader.fetchById("b").Question).toBe("Q2")
+    expect(GAIALocalLoader.getStats("validation").total).toBe(1)
+  })
+
+    it("falls back to a legacy validation.json array", () => {
+    writeFileSync(path.join(TEST_ROOT, "validation.json"), JSON.stringify([{ task_id: "a", Question: "Q1", Level: 1 }]))
+
+    expect(GAIALocalLoader.isDataAvailable()).toBe(true)
+    expect(GAIALocalLoader.fetchById("a").Level).toBe(1)
+  })
+
+  it("reports missing data when no split file exists", () => {
+    expect(GAIALocalLoader.isDataAvailable()).toBe(false)
+    expect(() => GAIALocalLoader.fetchById("a")).toThrow("GAIA validation data not found")
+  })
+})